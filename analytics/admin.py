@@ -0,0 +1,31 @@
+from django.contrib import admin
+from .models import DailyPoints, ChannelVCMinutes, DailyRedemptions
+
+
+class SummaryAdmin(admin.ModelAdmin):
+    """Read-only view of a summary table; rows are written by refresh_summaries."""
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(DailyPoints)
+class DailyPointsAdmin(SummaryAdmin):
+    list_display = ("date", "points_minted", "transactions")
+
+
+@admin.register(ChannelVCMinutes)
+class ChannelVCMinutesAdmin(SummaryAdmin):
+    list_display = ("date", "channel_id", "minutes")
+    list_filter = ("date",)
+
+
+@admin.register(DailyRedemptions)
+class DailyRedemptionsAdmin(SummaryAdmin):
+    list_display = ("date", "redemptions", "points_spent")
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.10 on 2026-10-19 19:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyPoints',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('points_minted', models.FloatField(default=0)),
+                ('transactions', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'points minted per day',
+                'db_table': 'dailypoints',
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyRedemptions',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('redemptions', models.IntegerField(default=0)),
+                ('points_spent', models.FloatField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'redemption volume per day',
+                'db_table': 'dailyredemptions',
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ChannelVCMinutes',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('channel_id', models.BigIntegerField(blank=True, null=True)),
+                ('minutes', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'VC minutes per channel',
+                'db_table': 'channelvcminutes',
+                'ordering': ['-date', '-minutes'],
+                'unique_together': {('date', 'channel_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,57 @@
+from django.db import models
+
+# Summary tables refreshed by the bot's analytics_task. The admin reads these
+# instead of aggregating over the live ledger.
+
+class DailyPoints(models.Model):
+    date = models.DateField(unique=True)
+    points_minted = models.FloatField(default=0)
+    transactions = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'dailypoints'
+        ordering = ['-date']
+        verbose_name_plural = 'points minted per day'
+
+    def __str__(self):
+        return str(self.date)
+
+
+class ChannelVCMinutes(models.Model):
+    date = models.DateField()
+    channel_id = models.BigIntegerField(null=True, blank=True)
+    minutes = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'channelvcminutes'
+        ordering = ['-date', '-minutes']
+        unique_together = [('date', 'channel_id')]
+        verbose_name_plural = 'VC minutes per channel'
+
+    def __str__(self):
+        return f"{self.date} {self.channel_id}"
+
+
+class DailyRedemptions(models.Model):
+    date = models.DateField(unique=True)
+    redemptions = models.IntegerField(default=0)
+    points_spent = models.FloatField(default=0)
+
+    class Meta:
+        db_table = 'dailyredemptions'
+        ordering = ['-date']
+        verbose_name_plural = 'redemption volume per day'
+
+    def __str__(self):
+        return str(self.date)
+
+
+class SummaryRefresh(models.Model):
+    # Single row recording when refresh_summaries last completed
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'summaryrefresh'
+
+    def __str__(self):
+        return str(self.refreshed_at)
@@ -0,0 +1,20 @@
+from django.core.paginator import Paginator
+from django.db.models import Max
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator for large append-only tables such as the Transaction ledger.
+
+    An unfiltered changelist is sized from MAX(id), which is a primary-key
+    lookup, instead of a COUNT(*) over the whole table. Filtered or searched
+    changelists still get an exact count. Tables whose rows can be deleted
+    should not use it, as the estimate would run past the last page.
+    """
+
+    @cached_property
+    def count(self):
+        query = self.object_list.query
+        if query.where:
+            return super().count
+        return query.model.objects.aggregate(n=Max("id"))["n"] or 0
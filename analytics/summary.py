@@ -0,0 +1,75 @@
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Min, Sum
+from django.utils import timezone
+
+from economy.models import Transaction
+from shop.models import Redemption
+from .models import DailyPoints, ChannelVCMinutes, DailyRedemptions, SummaryRefresh
+
+# Ledger actions that add points to a balance.
+MINT_ACTIONS = ("MESSAGE_REWARD", "ADMIN_ADD", "INTEREST")
+
+
+def day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def get_refresh_days(days=2):
+    """Days refresh_summary_day still has to rebuild, oldest first.
+
+    Without a watermark this starts at the oldest ledger or redemption row
+    (both MIN lookups use the timestamp indexes). Otherwise it starts at the
+    watermark day or `days` back, whichever is earlier.
+    """
+    today = timezone.localdate()
+    first = today - timedelta(days=days - 1)
+    last = SummaryRefresh.objects.filter(pk=1).first()
+    if last is not None:
+        first = min(first, timezone.localdate(last.refreshed_at))
+    else:
+        oldest = [
+            Transaction.objects.aggregate(t=Min("timestamp"))["t"],
+            Redemption.objects.aggregate(t=Min("created_at"))["t"],
+        ]
+        oldest = [timezone.localdate(t) for t in oldest if t is not None]
+        if oldest:
+            first = min(oldest)
+    return [first + timedelta(days=i) for i in range((today - first).days + 1)]
+
+
+def refresh_summary_day(day):
+    """Rebuild one day of every summary table and move the watermark past it.
+
+    Only ledger rows from that day are scanned, so each call stays short
+    enough to interleave with the bot's reward writes.
+    """
+    start, end = day_start(day), day_start(day + timedelta(days=1))
+    ledger = Transaction.objects.filter(timestamp__gte=start, timestamp__lt=end)
+
+    points = ledger.filter(action__in=MINT_ACTIONS).aggregate(points=Sum("amount"), n=Count("id"))
+    vc = ledger.filter(action="VC_REWARD").values("channel_id").annotate(minutes=Count("id")).order_by()
+    spent = Redemption.objects.filter(created_at__gte=start, created_at__lt=end).aggregate(
+        n=Count("id"), price=Sum("price")
+    )
+
+    with transaction.atomic():
+        for model in (DailyPoints, ChannelVCMinutes, DailyRedemptions):
+            model.objects.filter(date=day).delete()
+        if points["n"]:
+            DailyPoints.objects.create(date=day, points_minted=points["points"], transactions=points["n"])
+        ChannelVCMinutes.objects.bulk_create(
+            [ChannelVCMinutes(date=day, channel_id=r["channel_id"], minutes=r["minutes"]) for r in vc]
+        )
+        if spent["n"]:
+            DailyRedemptions.objects.create(date=day, redemptions=spent["n"], points_spent=spent["price"])
+        # A finished past day moves the watermark to the next one; today is
+        # rebuilt again on the next refresh.
+        SummaryRefresh.objects.update_or_create(pk=1, defaults={"refreshed_at": min(timezone.now(), end)})
+
+
+def refresh_summaries(days=2):
+    """Rebuild every outstanding day synchronously (for manage.py shell)."""
+    for day in get_refresh_days(days):
+        refresh_summary_day(day)
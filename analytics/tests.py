@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from economy.models import Transaction
+from .models import DailyPoints, ChannelVCMinutes, SummaryRefresh
+from .summary import get_refresh_days, refresh_summaries
+
+
+class RefreshSummaryTests(TestCase):
+    def add(self, action, days_ago, channel_id=None):
+        t = Transaction.objects.create(user_id=1, action=action, amount=1, channel_id=channel_id)
+        Transaction.objects.filter(pk=t.pk).update(timestamp=timezone.now() - timedelta(days=days_ago))
+
+    def test_first_refresh_walks_from_oldest_day(self):
+        self.add("MESSAGE_REWARD", 5)
+        self.add("VC_REWARD", 0, channel_id=7)
+        self.assertEqual(len(get_refresh_days()), 6)
+        refresh_summaries()
+        self.assertEqual(DailyPoints.objects.get().transactions, 1)
+        self.assertEqual(ChannelVCMinutes.objects.get().minutes, 1)
+        self.assertEqual(timezone.localdate(SummaryRefresh.objects.get().refreshed_at), timezone.localdate())
+
+    def test_watermark_without_minted_points(self):
+        self.add("DECAY", 30)
+        refresh_summaries()
+        self.assertFalse(DailyPoints.objects.exists())
+        self.assertEqual(len(get_refresh_days()), 2)
@@ -2,7 +2,9 @@ import discord
 from discord.ext import commands, tasks
 import os, django
 from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.utils import timezone
+from datetime import timedelta
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -14,8 +16,12 @@ load_dotenv(dotenv_path=env_path)
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "staffbot.settings")
 django.setup()
 
-from economy.models import UserProfile, Transaction
-from shop.models import ShopItem, Redemption
+from economy.models import UserProfile, ScheduledEvent
+from economy import scheduler
+from economy.journal import RewardJournal
+from economy import mutations
+from analytics.summary import get_refresh_days, refresh_summary_day
+from shop.models import ShopItem
 
 # ---------- CONFIG ----------
 TOKEN = os.getenv("DISCORD_TOKEN")
@@ -65,6 +71,11 @@ bot = commands.Bot(command_prefix=".", intents=intents, help_command=None)
 
 vc_tracker = {}
 message_count_tracker = {}
+reward_multipliers = {}
+journal = RewardJournal(settings.REWARD_JOURNAL_PATH)
+# Taken before any new appends, so replay never touches in-flight entries
+journal_replay = journal.uncommitted()
+started = False
 
 # ---------- DATABASE FUNCTIONS ----------
 @sync_to_async
@@ -78,8 +89,20 @@ def get_user(uid):
     return obj
 
 @sync_to_async
-def save_transaction(user_id, action, amount):
-    Transaction.objects.create(user_id=user_id, action=action, amount=amount)
+def apply_journal_entry(entry):
+    return mutations.apply_entry(entry)
+
+async def apply_mutation(user_id, action, amount, **changes):
+    # Journal first, then apply; see economy/journal.py
+    entry = journal.append(user_id, action, amount, **changes)
+    try:
+        status, redemption = await apply_journal_entry(entry)
+    except Exception:
+        # The caller sees the failure, so the entry must never be replayed
+        journal.abort(entry)
+        raise
+    journal.commit(entry)
+    return status, redemption
 
 @sync_to_async
 def get_shop_items():
@@ -89,10 +112,6 @@ def get_shop_items():
 def get_shop_item_by_name(name):
     return ShopItem.objects.filter(name__iexact=name).first()
 
-@sync_to_async
-def create_redemption(user_id, item_name, price):
-    return Redemption.objects.create(user_id=user_id, item_name=item_name, price=price, status="PENDING")
-
 @sync_to_async
 def add_shop_item(name, price, description):
     return ShopItem.objects.create(name=name, price=price, description=description)
@@ -109,6 +128,20 @@ def remove_shop_item(name):
 def reset_shop_items():
     ShopItem.objects.all().delete()
 
+@sync_to_async
+def create_scheduled_event(kind, rate, interval_minutes=1440, channel_id=None, ends_at=None):
+    return ScheduledEvent.objects.create(
+        kind=kind, rate=rate, interval_minutes=interval_minutes, channel_id=channel_id, ends_at=ends_at
+    )
+
+@sync_to_async
+def get_scheduled_events():
+    return list(scheduler.live_events())
+
+@sync_to_async
+def cancel_scheduled_event(event_id):
+    return ScheduledEvent.objects.filter(pk=event_id, enabled=True).update(enabled=False) > 0
+
 # ---------- MESSAGE → POINT SYSTEM ----------
 @bot.event
 async def on_message(message):
@@ -129,10 +162,8 @@ async def on_message(message):
     message_count_tracker[uid] = message_count_tracker.get(uid, 0) + 1
 
     if message_count_tracker[uid] >= 5:
-        user = await get_user(uid)
-        user.balance += 1
-        await sync_to_async(user.save)()
-        await save_transaction(uid, "MESSAGE_REWARD", 1)
+        reward = reward_multipliers.get(message.channel.id, 1)
+        await apply_mutation(uid, "MESSAGE_REWARD", reward, balance=reward, channel_id=message.channel.id)
         message_count_tracker[uid] = 0
 
     await bot.process_commands(message)
@@ -148,32 +179,81 @@ async def send_embed(ctx, title, description, color=0x00ff00):
 async def add_points(ctx, member: discord.Member, amount: int):
     if ctx.author.id != OWNER_ID and ctx.author.id not in ADMIN_IDS:
         return
-    user = await get_user(member.id)
-    user.balance += amount
-    await sync_to_async(user.save)()
-    await save_transaction(member.id, "ADMIN_ADD", amount)
+    await apply_mutation(member.id, "ADMIN_ADD", amount, balance=amount)
     await send_embed(ctx, "✅ Points Added", f"{amount} points added to {member.mention}", 0x00ff00)
 
 @bot.command()
 async def remove_points(ctx, member: discord.Member, amount: int):
     if ctx.author.id != OWNER_ID and ctx.author.id not in ADMIN_IDS:
         return
-    user = await get_user(member.id)
-    user.balance = max(0, user.balance - amount)
-    await sync_to_async(user.save)()
-    await save_transaction(member.id, "ADMIN_REMOVE", amount)
+    await apply_mutation(member.id, "ADMIN_REMOVE", amount, balance=-amount, mode="clamp")
     await send_embed(ctx, "❌ Points Removed", f"{amount} points removed from {member.mention}", 0xff0000)
 
 @bot.command()
 async def reset_points(ctx, member: discord.Member):
     if ctx.author.id != OWNER_ID and ctx.author.id not in ADMIN_IDS:
         return
-    user = await get_user(member.id)
-    user.balance = 0
-    await sync_to_async(user.save)()
-    await save_transaction(member.id, "ADMIN_RESET", 0)
+    await apply_mutation(member.id, "ADMIN_RESET", 0, balance=0, mode="set")
     await send_embed(ctx, "♻ Points Reset", f"Points reset for {member.mention}", 0xffff00)
 
+# ---------- SCHEDULED EVENTS ----------
+@bot.command()
+async def schedule_decay(ctx, percent: float, every_minutes: int = 1440):
+    if ctx.author.id != OWNER_ID and ctx.author.id not in ADMIN_IDS:
+        return
+    if not 0 < percent <= 100 or every_minutes <= 0:
+        return await send_embed(ctx, "❌ Error", "Decay must be above 0% and at most 100%, every 1 minute or more", 0xff0000)
+    event = await create_scheduled_event("DECAY", percent / 100, every_minutes)
+    await send_embed(ctx, "📉 Decay Scheduled", f"Balances decay by {percent}% every {every_minutes} minutes (ID: {event.id})", 0xffff00)
+
+@bot.command()
+async def schedule_interest(ctx, percent: float, every_minutes: int = 1440):
+    if ctx.author.id != OWNER_ID and ctx.author.id not in ADMIN_IDS:
+        return
+    if percent <= 0 or every_minutes <= 0:
+        return await send_embed(ctx, "❌ Error", "Interest must be above 0%, every 1 minute or more", 0xff0000)
+    event = await create_scheduled_event("INTEREST", percent / 100, every_minutes)
+    await send_embed(ctx, "📈 Interest Scheduled", f"Balances grow by {percent}% every {every_minutes} minutes (ID: {event.id})", 0x00ff00)
+
+@bot.command()
+async def multiplier(ctx, channel: discord.abc.GuildChannel, factor: int, minutes: int):
+    if ctx.author.id != OWNER_ID and ctx.author.id not in ADMIN_IDS:
+        return
+    # VC activity only earns minutes, not points, so only text channels take a multiplier
+    if channel.id not in ACTIVE_TEXT_CHANNEL_IDS:
+        return await send_embed(ctx, "❌ Error", f"{channel.mention} is not an active text reward channel", 0xff0000)
+    # Whole factors only, so every message reward stays a whole number of points
+    if factor < 1 or minutes <= 0:
+        return await send_embed(ctx, "❌ Error", "Factor must be a whole number of at least 1 and minutes above 0", 0xff0000)
+    ends_at = timezone.now() + timedelta(minutes=minutes)
+    event = await create_scheduled_event("MULTIPLIER", factor, channel_id=channel.id, ends_at=ends_at)
+    reward_multipliers.update(await sync_to_async(scheduler.get_active_multipliers)())
+    await send_embed(ctx, "⚡ Multiplier Active", f"{factor}x rewards in {channel.mention} for {minutes} minutes (ID: {event.id})", 0x00ff00)
+
+@bot.command()
+async def events(ctx):
+    if ctx.author.id != OWNER_ID and ctx.author.id not in ADMIN_IDS:
+        return
+    items = await get_scheduled_events()
+    embed = discord.Embed(title="🗓 Scheduled Events", color=0xffff00, timestamp=timezone.now())
+    if not items:
+        embed.description = "No scheduled events"
+    for e in items:
+        if e.kind == "MULTIPLIER":
+            value = f"{e.rate}x in <#{e.channel_id}> until {e.ends_at:%Y-%m-%d %H:%M} UTC"
+        else:
+            value = f"{e.rate * 100:g}% every {e.interval_minutes} minutes"
+        embed.add_field(name=f"#{e.id} {e.kind}", value=value, inline=False)
+    await ctx.send(embed=embed)
+
+@bot.command()
+async def cancel_event(ctx, event_id: int):
+    if ctx.author.id != OWNER_ID and ctx.author.id not in ADMIN_IDS:
+        return
+    if not await cancel_scheduled_event(event_id):
+        return await send_embed(ctx, "❌ Error", "Event not found", 0xff0000)
+    await send_embed(ctx, "🛑 Event Cancelled", f"Scheduled event {event_id} cancelled", 0xff0000)
+
 # ---------- HELP COMMAND ----------
 @bot.command()
 async def help(ctx):
@@ -191,6 +271,11 @@ async def help(ctx):
         embed.add_field(name=".add_shop", value="Add shop item", inline=False)
         embed.add_field(name=".remove_shop", value="Remove shop item", inline=False)
         embed.add_field(name=".reset_shop", value="Reset shop", inline=False)
+        embed.add_field(name=".schedule_decay <pct> [mins]", value="Schedule balance decay", inline=False)
+        embed.add_field(name=".schedule_interest <pct> [mins]", value="Schedule balance interest", inline=False)
+        embed.add_field(name=".multiplier #channel <x> <mins>", value="Boost message rewards in a channel", inline=False)
+        embed.add_field(name=".events", value="List scheduled events", inline=False)
+        embed.add_field(name=".cancel_event <ID>", value="Cancel scheduled event", inline=False)
     else:
         embed.add_field(name=".balance", value="Check your balance", inline=False)
         embed.add_field(name=".shop", value="View shop", inline=False)
@@ -219,6 +304,17 @@ async def shop(ctx):
             embed.add_field(name=f"{i.name} - {i.price}", value=i.description, inline=False)
     await ctx.send(embed=embed)
 
+async def notify_redemption(redemption, title="🛒 Redemption Request"):
+    admin_channel = bot.get_channel(ADMIN_CHANNEL_ID)
+    admin_embed = discord.Embed(
+        title=title,
+        description=f"**User:** <@{redemption.user_id}>\n**Item:** {redemption.item_name}\n**Price:** {redemption.price} points\n**Redemption ID:** {redemption.id}",
+        color=0x00ff00,
+        timestamp=timezone.now()
+    )
+    admin_embed.set_footer(text="Use .accept <ID> or .deny <ID> to process")
+    await admin_channel.send(embed=admin_embed)
+
 @bot.command()
 async def buy(ctx, *, item_name):
     item = await get_shop_item_by_name(item_name)
@@ -228,27 +324,17 @@ async def buy(ctx, *, item_name):
         embed.description = "Item not found"
         embed.color = 0xff0000
         return await ctx.send(embed=embed)
-    user = await get_user(ctx.author.id)
-    if user.balance < item.price:
+    # The balance check is part of the debit, so concurrent buys cannot overdraw
+    status, redemption = await apply_mutation(
+        ctx.author.id, "PURCHASE", item.price, balance=-item.price, mode="debit", item_name=item.name
+    )
+    if status == mutations.REJECTED:
         embed.title = "❌ Error"
         embed.description = "Not enough points"
         embed.color = 0xff0000
         return await ctx.send(embed=embed)
     
-    user.balance -= item.price
-    await sync_to_async(user.save)()
-    
-    redemption = await create_redemption(ctx.author.id, item.name, item.price)
-    
-    admin_channel = bot.get_channel(ADMIN_CHANNEL_ID)
-    admin_embed = discord.Embed(
-        title="🛒 Redemption Request",
-        description=f"**User:** {ctx.author.mention}\n**Item:** {item.name}\n**Price:** {item.price} points\n**Redemption ID:** {redemption.id}",
-        color=0x00ff00,
-        timestamp=timezone.now()
-    )
-    admin_embed.set_footer(text="Use .accept <ID> or .deny <ID> to process")
-    await admin_channel.send(embed=admin_embed)
+    await notify_redemption(redemption)
     
     embed.title = "✅ Success"
     embed.description = "Redemption request sent to admins"
@@ -262,10 +348,38 @@ async def vc_stats(ctx):
     embed = discord.Embed(title="🎧 VC Stats", description=f"VC Time: **{u.vc_minutes} minutes**", color=0x00ff00, timestamp=timezone.now())
     await ctx.send(embed=embed)
 
+# ---------- JOURNAL REPLAY ----------
+async def replay_journal():
+    # Replay mutations journaled before a crash but never committed. Failures
+    # stay in journal_replay and are retried by journal_task, so they do not
+    # hold up compaction until the next restart.
+    failed = []
+    for entry in journal_replay:
+        try:
+            status, redemption = await apply_journal_entry(entry)
+        except Exception as e:
+            print(f"Journal replay failed for {entry['id']}: {e}")
+            failed.append(entry)
+            continue
+        journal.commit(entry)
+        # The crash came before buy notified anyone, so staff hear about it now
+        if redemption is not None:
+            await notify_redemption(redemption, title="🛒 Redemption Request (recovered after restart)")
+    journal_replay[:] = failed
+
 # ---------- ON READY ----------
 @bot.event
 async def on_ready():
+    # on_ready fires again after a failed RESUME; replay and task start run once
+    global started
+    if started:
+        return
+    started = True
+    await replay_journal()
     vc_task.start()
+    scheduler_task.start()
+    analytics_task.start()
+    journal_task.start()
     print("Bot Online")
 
 # ---------- VC LOOP ----------
@@ -301,8 +415,6 @@ async def vc_task():
                 if member.id not in afk_tracker:
                     afk_tracker[member.id] = 0
 
-                user = await get_user(member.id)
-
                 # ---------------- AFK CHECK ----------------
                 if member.voice.self_mute or member.voice.self_deaf:
                     afk_tracker[member.id] += 1
@@ -320,10 +432,37 @@ async def vc_task():
                 else:
                     afk_tracker[member.id] = 0
 
-                    user.vc_minutes = user.vc_minutes or 0
-                    user.vc_minutes += 1
+                    await apply_mutation(member.id, "VC_REWARD", 1, vc_minutes=1, channel_id=vc.id)
 
-                    await sync_to_async(user.save)()
-                    await save_transaction(member.id, "VC_REWARD", 1)
+# ---------- SCHEDULER LOOP ----------
+@tasks.loop(minutes=1)
+async def scheduler_task():
+    now = timezone.now()
+    active = await sync_to_async(scheduler.get_active_multipliers)(now)
+    reward_multipliers.clear()
+    reward_multipliers.update(active)
+
+    for event in await sync_to_async(scheduler.get_due_events)(now):
+        factor = scheduler.balance_factor(event)
+        # One awaited call per chunk keeps the event loop and other DB calls
+        # responsive during a pass over the whole profile table.
+        for lo, hi in await sync_to_async(scheduler.get_profile_id_chunks)(event.cursor):
+            await sync_to_async(scheduler.adjust_balance_chunk)(event.id, lo, hi, factor, event.kind)
+        await sync_to_async(scheduler.mark_event_run)(event.id, now)
+
+# ---------- ANALYTICS LOOP ----------
+@tasks.loop(minutes=15)
+async def analytics_task():
+    # One awaited call per day, so a full-history rebuild never holds the
+    # DB thread for longer than a single day's aggregate.
+    for day in await sync_to_async(get_refresh_days)():
+        await sync_to_async(refresh_summary_day)(day)
+
+# ---------- JOURNAL FSYNC LOOP ----------
+@tasks.loop(seconds=1)
+async def journal_task():
+    if journal_replay:
+        await replay_journal()
+    await sync_to_async(journal.sync, thread_sensitive=False)()
 
 bot.run(TOKEN)
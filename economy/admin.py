@@ -1,5 +1,33 @@
 from django.contrib import admin
-from .models import UserProfile, Transaction
+from analytics.paginator import EstimatedCountPaginator
+from .models import UserProfile, Transaction, ScheduledEvent
 
-admin.site.register(UserProfile)
-admin.site.register(Transaction)
\ No newline at end of file
+
+@admin.register(UserProfile)
+class UserProfileAdmin(admin.ModelAdmin):
+    list_display = ("user_id", "balance", "vc_minutes")
+    search_fields = ("=user_id",)
+    ordering = ("-id",)
+    show_full_result_count = False
+
+
+@admin.register(Transaction)
+class TransactionAdmin(admin.ModelAdmin):
+    list_display = ("id", "user_id", "action", "amount", "channel_id", "timestamp")
+    search_fields = ("=user_id",)
+    ordering = ("-id",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    # The ledger is append-only; EstimatedCountPaginator relies on it
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+admin.site.register(ScheduledEvent)
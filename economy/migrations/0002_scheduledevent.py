@@ -0,0 +1,29 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('economy', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduledEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('DECAY', 'Balance decay'), ('INTEREST', 'Balance interest'), ('MULTIPLIER', 'Reward multiplier')], max_length=20)),
+                ('rate', models.FloatField()),
+                ('channel_id', models.BigIntegerField(blank=True, null=True)),
+                ('interval_minutes', models.IntegerField(default=1440)),
+                ('starts_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('ends_at', models.DateTimeField(blank=True, null=True)),
+                ('last_run', models.DateTimeField(blank=True, null=True)),
+                ('enabled', models.BooleanField(default=True)),
+            ],
+            options={
+                'db_table': 'scheduledevents',
+            },
+        ),
+    ]
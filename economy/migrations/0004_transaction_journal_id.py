@@ -0,0 +1,18 @@
+# Generated by Django 5.2.10 on 2026-10-19 19:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('economy', '0003_transaction_channel_id_and_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='journal_id',
+            field=models.CharField(blank=True, max_length=32, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.10 on 2026-10-19 19:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('economy', '0004_transaction_journal_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduledevent',
+            name='cursor',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
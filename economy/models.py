@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 class UserProfile(models.Model):
     user_id = models.BigIntegerField(unique=True)
@@ -12,10 +13,39 @@ class UserProfile(models.Model):
 
 
 class Transaction(models.Model):
-    user_id = models.BigIntegerField()
+    user_id = models.BigIntegerField(db_index=True)
     action = models.CharField(max_length=50)
     amount = models.FloatField()
-    timestamp = models.DateTimeField(auto_now_add=True)
+    channel_id = models.BigIntegerField(null=True, blank=True)
+    journal_id = models.CharField(max_length=32, null=True, blank=True, unique=True)
+    timestamp = models.DateTimeField(auto_now_add=True, db_index=True)
     
     class Meta:
         db_table = 'transactions'
+
+
+class ScheduledEvent(models.Model):
+    KIND_CHOICES = [
+        ("DECAY", "Balance decay"),
+        ("INTEREST", "Balance interest"),
+        ("MULTIPLIER", "Reward multiplier"),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    # DECAY / INTEREST: fraction of balance per run (0.05 = 5%)
+    # MULTIPLIER: factor applied to rewards in channel_id (2 = double points)
+    rate = models.FloatField()
+    channel_id = models.BigIntegerField(null=True, blank=True)
+    interval_minutes = models.IntegerField(default=1440)
+    starts_at = models.DateTimeField(default=timezone.now)
+    ends_at = models.DateTimeField(null=True, blank=True)
+    last_run = models.DateTimeField(null=True, blank=True)
+    # Next UserProfile id of an unfinished decay / interest pass
+    cursor = models.BigIntegerField(null=True, blank=True)
+    enabled = models.BooleanField(default=True)
+
+    class Meta:
+        db_table = 'scheduledevents'
+
+    def __str__(self):
+        return f"ScheduledEvent(kind={self.kind}, rate={self.rate})"
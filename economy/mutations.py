@@ -0,0 +1,55 @@
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+
+from shop.models import Redemption
+from .models import UserProfile, Transaction
+
+# apply_entry outcomes
+APPLIED = "APPLIED"
+ALREADY_APPLIED = "ALREADY_APPLIED"
+REJECTED = "REJECTED"
+
+
+def apply_entry(entry):
+    """Apply one RewardJournal entry; returns (status, redemption).
+
+    Balance, ledger row and redemption land together, and the journal id on
+    the ledger row makes applying an entry twice a no-op (ALREADY_APPLIED,
+    with the redemption it created, if any). Clamps and balance checks happen
+    in the UPDATE itself, against the current balance; a debit that would
+    overdraw writes nothing and is REJECTED.
+    """
+    with transaction.atomic():
+        if Transaction.objects.filter(journal_id=entry["id"]).exists():
+            return ALREADY_APPLIED, Redemption.objects.filter(journal_id=entry["id"]).first()
+        UserProfile.objects.get_or_create(user_id=entry["user_id"])
+        profile = UserProfile.objects.filter(user_id=entry["user_id"])
+        mode = entry["mode"]
+        if mode == "set":
+            balance = Value(float(entry["balance"]))
+        elif mode == "clamp":
+            balance = Greatest(F("balance") + entry["balance"], Value(0.0))
+        else:
+            balance = F("balance") + entry["balance"]
+        if mode == "debit":
+            profile = profile.filter(balance__gte=-entry["balance"])
+        if not profile.update(balance=balance, vc_minutes=F("vc_minutes") + entry["vc_minutes"]):
+            return REJECTED, None
+        Transaction.objects.create(
+            user_id=entry["user_id"],
+            action=entry["action"],
+            amount=entry["amount"],
+            channel_id=entry["channel_id"],
+            journal_id=entry["id"],
+        )
+        redemption = None
+        if entry["item_name"]:
+            redemption = Redemption.objects.create(
+                user_id=entry["user_id"],
+                item_name=entry["item_name"],
+                price=entry["amount"],
+                status="PENDING",
+                journal_id=entry["id"],
+            )
+    return APPLIED, redemption
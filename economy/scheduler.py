@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Max, Min, Q
+from django.db.models.functions import Round
+from django.utils import timezone
+
+from .models import UserProfile, Transaction, ScheduledEvent
+
+# Rows touched per UPDATE. Each chunk is its own short transaction so the
+# bot's reward writes can interleave with a long decay / interest pass.
+CHUNK_SIZE = 5000
+
+# Event kinds that adjust every balance; the kind doubles as the ledger action.
+BALANCE_KINDS = ("DECAY", "INTEREST")
+
+
+def live_events(now=None):
+    now = now or timezone.now()
+    return ScheduledEvent.objects.filter(
+        enabled=True,
+        starts_at__lte=now,
+    ).filter(Q(ends_at__isnull=True) | Q(ends_at__gt=now))
+
+
+def get_due_events(now=None):
+    now = now or timezone.now()
+    due = []
+    for event in live_events(now).filter(kind__in=BALANCE_KINDS):
+        if event.last_run is None or event.last_run + timedelta(minutes=event.interval_minutes) <= now:
+            due.append(event)
+    return due
+
+
+def get_active_multipliers(now=None):
+    multipliers = {}
+    for channel_id, rate in live_events(now).filter(kind="MULTIPLIER").values_list("channel_id", "rate"):
+        multipliers[channel_id] = max(int(rate), multipliers.get(channel_id, 1))
+    return multipliers
+
+
+def balance_factor(event):
+    if event.kind == "DECAY":
+        return 1 - event.rate
+    return 1 + event.rate
+
+
+def get_profile_id_chunks(start=None, chunk_size=CHUNK_SIZE):
+    bounds = UserProfile.objects.aggregate(lo=Min("id"), hi=Max("id"))
+    if bounds["lo"] is None:
+        return []
+    lo = max(bounds["lo"], start or 0)
+    return [(i, i + chunk_size) for i in range(lo, bounds["hi"] + 1, chunk_size)]
+
+
+def adjust_balance_chunk(event_id, lo, hi, factor, action):
+    """Scale every positive balance with lo <= id < hi by factor.
+
+    The balance change is a single UPDATE ... SET balance =
+    ROUND(balance * factor, 2), so small balances still move by fractions of
+    a point; the matching ledger rows are the difference between the
+    balances read before and after it, written with one bulk_create. The
+    event's cursor moves past the chunk in the same transaction, so an
+    interrupted pass resumes without repeating it.
+    """
+    rows = UserProfile.objects.filter(id__gte=lo, id__lt=hi, balance__gt=0)
+    with transaction.atomic():
+        ScheduledEvent.objects.filter(pk=event_id).update(cursor=hi)
+        before = list(rows.values_list("id", "user_id", "balance"))
+        if not before:
+            return 0
+        rows.update(balance=Round(F("balance") * factor, 2))
+        after = dict(UserProfile.objects.filter(id__gte=lo, id__lt=hi).values_list("id", "balance"))
+        ledger = [
+            Transaction(user_id=uid, action=action, amount=round(abs(after[pk] - bal), 2))
+            for pk, uid, bal in before
+            if after[pk] != bal
+        ]
+        Transaction.objects.bulk_create(ledger, batch_size=CHUNK_SIZE)
+    return len(ledger)
+
+
+def mark_event_run(event_id, now=None):
+    ScheduledEvent.objects.filter(pk=event_id).update(last_run=now or timezone.now(), cursor=None)
+
+
+def run_balance_event(event, now=None):
+    """Run a whole decay / interest pass synchronously (for manage.py shell)."""
+    factor = balance_factor(event)
+    total = 0
+    for lo, hi in get_profile_id_chunks(event.cursor):
+        total += adjust_balance_chunk(event.pk, lo, hi, factor, event.kind)
+    mark_event_run(event.pk, now)
+    return total
@@ -0,0 +1,120 @@
+import os
+import tempfile
+
+from django.test import SimpleTestCase, TestCase
+
+from shop.models import Redemption
+from .journal import RewardJournal
+from .models import UserProfile, Transaction, ScheduledEvent
+from . import mutations, scheduler
+
+
+class BalanceEventTests(TestCase):
+    def run_event(self, kind, rate, balances):
+        for uid, balance in enumerate(balances):
+            UserProfile.objects.create(user_id=uid, balance=balance)
+        event = ScheduledEvent.objects.create(kind=kind, rate=rate)
+        scheduler.run_balance_event(event)
+        return list(UserProfile.objects.order_by("user_id").values_list("balance", flat=True))
+
+    def test_decay_moves_small_balances(self):
+        self.assertEqual(self.run_event("DECAY", 0.05, [9, 1, 7, 0]), [8.55, 0.95, 6.65, 0])
+        amounts = dict(Transaction.objects.filter(action="DECAY").values_list("user_id", "amount"))
+        self.assertEqual(amounts, {0: 0.45, 1: 0.05, 2: 0.35})
+
+    def test_interest_moves_small_balances(self):
+        self.assertEqual(self.run_event("INTEREST", 0.01, [9, 1]), [9.09, 1.01])
+
+    def test_interrupted_pass_resumes_from_cursor(self):
+        for uid in range(3):
+            UserProfile.objects.create(user_id=uid, balance=100)
+        event = ScheduledEvent.objects.create(kind="DECAY", rate=0.1)
+        lo, hi = scheduler.get_profile_id_chunks(chunk_size=2)[0]
+        scheduler.adjust_balance_chunk(event.pk, lo, hi, 0.9, "DECAY")
+        event.refresh_from_db()
+        scheduler.run_balance_event(event)
+        self.assertEqual(set(UserProfile.objects.values_list("balance", flat=True)), {90})
+        self.assertEqual(Transaction.objects.count(), 3)
+
+
+class RewardJournalTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "rewards.journal")
+
+    def reopen(self, journal):
+        journal.close()
+        return RewardJournal(self.path)
+
+    def test_commit_and_abort_are_not_replayed(self):
+        journal = RewardJournal(self.path)
+        committed = journal.append(1, "MESSAGE_REWARD", 1, balance=1)
+        aborted = journal.append(2, "PURCHASE", 5, balance=-5, mode="debit", item_name="Nitro")
+        pending = journal.append(3, "ADMIN_ADD", 4, balance=4)
+        journal.commit(committed)
+        journal.abort(aborted)
+        self.assertEqual(journal.uncommitted(), [pending])
+        journal = self.reopen(journal)
+        self.assertEqual(journal.uncommitted(), [pending])
+        journal.close()
+
+    def test_torn_tail_is_truncated(self):
+        journal = RewardJournal(self.path)
+        entry = journal.append(1, "MESSAGE_REWARD", 1, balance=1)
+        size = os.path.getsize(self.path)
+        os.write(journal.fd, b"\x40\x00\x00\x00\x00\x00\x00\x00{\"id\"")
+        journal = self.reopen(journal)
+        self.assertEqual(journal.uncommitted(), [entry])
+        self.assertEqual(os.path.getsize(self.path), size)
+        journal.close()
+
+
+class ApplyEntryTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.journal = RewardJournal(os.path.join(tmp.name, "rewards.journal"))
+        self.addCleanup(self.journal.close)
+        UserProfile.objects.create(user_id=1, balance=10)
+
+    def apply(self, action, amount, **changes):
+        return mutations.apply_entry(self.journal.append(1, action, amount, **changes))
+
+    def balance(self):
+        return UserProfile.objects.get(user_id=1).balance
+
+    def test_replay_is_idempotent(self):
+        entry = self.journal.append(1, "PURCHASE", 4, balance=-4, mode="debit", item_name="Nitro")
+        status, redemption = mutations.apply_entry(entry)
+        self.assertEqual(status, mutations.APPLIED)
+        status, again = mutations.apply_entry(entry)
+        self.assertEqual((status, again), (mutations.ALREADY_APPLIED, redemption))
+        self.assertEqual(self.balance(), 6)
+        self.assertEqual(Transaction.objects.filter(journal_id=entry["id"]).count(), 1)
+        self.assertEqual(Redemption.objects.count(), 1)
+
+    def test_add(self):
+        self.assertEqual(self.apply("MESSAGE_REWARD", 2, balance=2), (mutations.APPLIED, None))
+        self.assertEqual(self.balance(), 12)
+
+    def test_debit_rejects_overdraw(self):
+        self.assertEqual(self.apply("PURCHASE", 8, balance=-8, mode="debit", item_name="Nitro")[0], mutations.APPLIED)
+        self.assertEqual(self.apply("PURCHASE", 8, balance=-8, mode="debit", item_name="Nitro"), (mutations.REJECTED, None))
+        self.assertEqual(self.balance(), 2)
+        self.assertEqual(Redemption.objects.count(), 1)
+        self.assertEqual(Transaction.objects.count(), 1)
+
+    def test_clamp_stops_at_zero(self):
+        self.apply("ADMIN_REMOVE", 25, balance=-25, mode="clamp")
+        self.assertEqual(self.balance(), 0)
+
+    def test_set_uses_current_balance(self):
+        self.apply("MESSAGE_REWARD", 1, balance=1)
+        self.apply("ADMIN_RESET", 0, balance=0, mode="set")
+        self.assertEqual(self.balance(), 0)
+
+    def test_vc_minutes(self):
+        self.apply("VC_REWARD", 1, vc_minutes=1, channel_id=7)
+        profile = UserProfile.objects.get(user_id=1)
+        self.assertEqual((profile.balance, profile.vc_minutes), (10, 1))
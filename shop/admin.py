@@ -2,4 +2,12 @@ from django.contrib import admin
 from .models import ShopItem, Redemption
 
 admin.site.register(ShopItem)
-admin.site.register(Redemption)
+
+
+@admin.register(Redemption)
+class RedemptionAdmin(admin.ModelAdmin):
+    list_display = ("id", "user_id", "item_name", "price", "status", "created_at")
+    list_filter = ("status",)
+    search_fields = ("=user_id",)
+    ordering = ("-id",)
+    show_full_result_count = False
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.10 on 2026-10-19 19:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0002_alter_redemption_created_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='redemption',
+            name='journal_id',
+            field=models.CharField(blank=True, max_length=32, null=True, unique=True),
+        ),
+    ]
@@ -16,7 +16,8 @@ class Redemption(models.Model):
     item_name = models.CharField(max_length=100)
     price = models.FloatField()
     status = models.CharField(max_length=20, default="PENDING")
-    created_at = models.DateTimeField(auto_now_add=True)
+    journal_id = models.CharField(max_length=32, null=True, blank=True, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
 class Meta:
     db_table = 'redemption'
\ No newline at end of file
@@ -40,6 +40,7 @@ INSTALLED_APPS = [
     'economy',
     'shop',
     'invites',
+    'analytics',
 ]
 
 MIDDLEWARE = [
@@ -124,3 +125,6 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Write-ahead journal for balance mutations (see economy/journal.py)
+REWARD_JOURNAL_PATH = BASE_DIR / 'rewards.journal'